@@ -2,11 +2,12 @@
 API endpoints for digest generation and retrieval.
 """
 
-from dataclasses import asdict
+from collections import Counter
 from typing import Annotated
 
+import msgspec
 from celery.result import AsyncResult
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.loader import load_topics
@@ -28,7 +29,7 @@ DBSession = Annotated[AsyncSession, Depends(get_db)]
 
 # Test / pipeline endpoints
 @router.get("/test/fetch")
-async def test_fetch(topic_id: str | None = None):
+async def test_fetch(request: Request, topic_id: str | None = None):
     """Raw RSS fetch — no deduplication, no DB."""
     topics_data = load_topics()
     if topic_id:
@@ -37,12 +38,12 @@ async def test_fetch(topic_id: str | None = None):
             raise HTTPException(status_code=404, detail=f"Topic '{topic_id}' not found")
         topics_data = {"topics": matched}
 
-    articles = await fetch_all_feeds(topics_data)
-    return {"count": len(articles), "articles": [asdict(a) for a in articles]}
+    articles = await fetch_all_feeds(topics_data, request.app.state.http)
+    return _json_response({"count": len(articles), "articles": articles})
 
 
 @router.get("/test/dedupe")
-async def test_dedupe(topic_id: str | None = None):
+async def test_dedupe(request: Request, topic_id: str | None = None):
     """Fetch + deduplicate. Shows before/after counts per topic."""
     topics_data = load_topics()
     if topic_id:
@@ -51,38 +52,33 @@ async def test_dedupe(topic_id: str | None = None):
             raise HTTPException(status_code=404, detail=f"Topic '{topic_id}' not found")
         topics_data = {"topics": matched}
 
-    articles = await fetch_all_feeds(topics_data)
+    articles = await fetch_all_feeds(topics_data, request.app.state.http)
     deduped = deduplicate(articles)
 
-    before_by_topic: dict[str, int] = {}
-    for a in articles:
-        before_by_topic[a.topic] = before_by_topic.get(a.topic, 0) + 1
-
-    after_by_topic: dict[str, int] = {}
-    for a in deduped:
-        after_by_topic[a.topic] = after_by_topic.get(a.topic, 0) + 1
+    before_by_topic = Counter(a.topic for a in articles)
+    after_by_topic = Counter(a.topic for a in deduped)
 
     topic_summary = [
         {
             "topic": topic,
-            "before": before_by_topic.get(topic, 0),
-            "after": after_by_topic.get(topic, 0),
-            "removed": before_by_topic.get(topic, 0) - after_by_topic.get(topic, 0),
+            "before": before_by_topic[topic],
+            "after": after_by_topic[topic],
+            "removed": before_by_topic[topic] - after_by_topic[topic],
         }
-        for topic in before_by_topic
+        for topic in {**before_by_topic, **after_by_topic}
     ]
 
-    return {
+    return _json_response({
         "total_before": len(articles),
         "total_after": len(deduped),
         "total_removed": len(articles) - len(deduped),
         "by_topic": topic_summary,
-        "articles": [asdict(a) for a in deduped],
-    }
+        "articles": deduped,
+    })
 
 
 @router.get("/test/summarize")
-async def test_summarize(db: DBSession, topic_id: str | None = None):
+async def test_summarize(request: Request, db: DBSession, topic_id: str | None = None):
     """Run the full digest pipeline inline (fetch → dedupe → summarize → persist)."""
     topics_data = load_topics()
     if topic_id:
@@ -91,12 +87,12 @@ async def test_summarize(db: DBSession, topic_id: str | None = None):
             raise HTTPException(status_code=404, detail=f"Topic '{topic_id}' not found")
         topics_data = {"topics": matched}
 
-    articles = await fetch_all_feeds(topics_data)
+    articles = await fetch_all_feeds(topics_data, request.app.state.http)
     deduped = deduplicate(articles)
     digest = await summarize(deduped, topics_data)
     db_digest = await save_digest(db, digest, deduped)
 
-    return {
+    return _json_response({
         "digest_id": db_digest.id,
         "generated_at": digest.generated_at.isoformat(),
         "total_articles_summarized": digest.total_articles_summarized,
@@ -109,7 +105,7 @@ async def test_summarize(db: DBSession, topic_id: str | None = None):
             }
             for t in digest.topics
         ],
-    }
+    })
 
 
 # Async digest generation (Celery)
@@ -201,6 +197,11 @@ async def list_all_digests(db: DBSession, limit: int = 10):
 
 
 # Internal helpers
+def _json_response(payload: dict) -> Response:
+    """Encode a payload containing msgspec Structs, bypassing FastAPI's encoder."""
+    return Response(content=msgspec.json.encode(payload), media_type="application/json")
+
+
 def _format_digest(digest) -> dict:
     return {
         "digest_id": digest.id,
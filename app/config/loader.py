@@ -2,15 +2,29 @@
 Load topics from the topics.json file.
 """
 
-import json
+from functools import lru_cache
 from pathlib import Path
 
+import orjson
+
 def load_topics(path: str = "app/config/topics.json") -> dict:
-    """Read topics from the topics.json file and validate them."""
+    """Read topics from the topics.json file and validate them.
+
+    The parsed config is cached and only re-read when the file's mtime changes,
+    so callers share one dict and must not mutate it.
+    """
     p = Path(path)
-    if not p.exists():
-        raise FileNotFoundError(f"Config not found: {p}")
-    data = json.loads(p.read_text(encoding="utf-8"))
+    try:
+        mtime_ns = p.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config not found: {p}") from None
+    return _load_topics_cached(path, mtime_ns)
+
+
+@lru_cache(maxsize=1)
+def _load_topics_cached(path: str, mtime_ns: int) -> dict:
+    """Parse and validate topics.json; mtime_ns is part of the cache key."""
+    data = orjson.loads(Path(path).read_bytes())
 
     topics = data.get("topics", [])
     if not isinstance(topics, list) or len(topics) == 0:
@@ -34,3 +48,7 @@ def load_topics(path: str = "app/config/topics.json") -> dict:
                 raise ValueError(f"Topic '{tid}' sources must contain name + url")
 
     return data
+
+
+# Allow a manual reload without touching the file
+load_topics.cache_clear = _load_topics_cached.cache_clear
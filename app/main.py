@@ -10,10 +10,12 @@ load_dotenv()
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config.loader import load_topics
 from app.api.routes import router
 from app.db.database import engine
+from app.services.fetcher import create_client, shutdown_parse_pool
 
 
 @asynccontextmanager
@@ -23,9 +25,17 @@ async def lifespan(app: FastAPI):
     if not os.getenv("DATABASE_URL"):
         raise RuntimeError("DATABASE_URL is not set in .env")
 
+    # Validate topics.json up front; this also warms the load_topics cache
+    load_topics()
+
     print("✅ Startup checks passed")
+
+    # Shared HTTP client so feed fetches reuse pooled connections
+    app.state.http = create_client()
     yield
 
+    await app.state.http.aclose()
+    shutdown_parse_pool()
     await engine.dispose()
     print("🔌 Database engine disposed")
 
@@ -35,6 +45,7 @@ app = FastAPI(
     description="Automated content aggregation with AI-powered summaries",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Enable CORS so the browser allows frontend (5173) to call backend (8000) across origins.
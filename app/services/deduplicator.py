@@ -5,38 +5,37 @@ Article deduplication service.
 import logging
 import re
 import string
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from itertools import chain
 
 from app.services.fetcher import Article
 
 logger = logging.getLogger(__name__)
 
 # Articles with title similarity >= this threshold are considered duplicates.
-SIMILARITY_THRESHOLD = 0.6
+# Kept as an integer ratio so the hot loop can compare without float math.
+THRESH_NUM, THRESH_DEN = 3, 5
+SIMILARITY_THRESHOLD = THRESH_NUM / THRESH_DEN
 
-STOPWORDS = {
+STOPWORDS = frozenset({
     "a", "an", "the", "and", "or", "but", "in", "on", "at", "to", "for",
     "of", "with", "is", "are", "was", "were", "be", "been", "has", "have",
     "had", "it", "its", "this", "that", "by", "from", "as", "new", "how",
     "why", "what", "who", "will", "can", "just", "more", "up", "about",
-}
+})
+
+_PUNCT_TABLE = str.maketrans("", "", string.punctuation)
 
 
 # Helpers
 def _normalize(title: str) -> set[str]:
     """Normalize a title by converting it to lowercase, removing punctuation, and splitting into words."""
     title = title.lower()
-    title = title.translate(str.maketrans("", "", string.punctuation))
+    title = title.translate(_PUNCT_TABLE)
     words = title.split()
     return {w for w in words if w not in STOPWORDS and len(w) > 1}
 
-def _jaccard(set_a: set[str], set_b: set[str]) -> float:
-    """Calculate the Jaccard similarity between two sets of words."""
-    if not set_a and not set_b:
-        return 0.0
-    intersection = len(set_a & set_b)
-    union = len(set_a | set_b)
-    return intersection / union
-
 # Public interface
 def deduplicate(articles: list[Article]) -> list[Article]:
     """Deduplicate articles within each topic by URL and title similarity."""
@@ -51,7 +50,11 @@ def deduplicate(articles: list[Article]) -> list[Article]:
     for topic, topic_articles in by_topic.items():
         kept: list[Article] = []
         kept_urls: set[str] = set()
-        kept_title_sets: list[set[str]] = []
+        kept_title_sizes: list[int] = []
+        # Inverted index: word -> (sizes, positions) of kept titles containing
+        # it, both sorted by title size. Titles sharing no word have zero
+        # similarity, so only titles reached through the index are compared.
+        word_index: dict[str, tuple[list[int], list[int]]] = {}
 
         for article in topic_articles:
             # 1. URL deduplication
@@ -60,12 +63,30 @@ def deduplicate(articles: list[Article]) -> list[Article]:
                 continue
 
             # 2. Title similarity
+            # Counting how often each kept title appears in the postings of
+            # the new title's words yields every intersection size at once, so
+            # no sets are built per pair. Union size follows from stored sizes.
             normalized = _normalize(article.title)
+            n_new = len(normalized)
             is_duplicate = False
 
-            for kept_title_set in kept_title_sets:
-                score = _jaccard(normalized, kept_title_set)
-                if score >= SIMILARITY_THRESHOLD:
+            # Jaccard can never exceed min/max of the set sizes, so only kept
+            # titles with a size in [lo, hi] can reach the threshold.
+            lo = -(-n_new * THRESH_NUM // THRESH_DEN)
+            hi = n_new * THRESH_DEN // THRESH_NUM
+            windows = []
+            for word in normalized:
+                if word in word_index:
+                    sizes, positions = word_index[word]
+                    windows.append(
+                        positions[bisect_left(sizes, lo):bisect_right(sizes, hi)]
+                    )
+
+            overlaps = Counter(chain.from_iterable(windows))
+
+            for i, inter in overlaps.items():
+                union = n_new + kept_title_sizes[i] - inter
+                if inter * THRESH_DEN >= THRESH_NUM * union:
                     is_duplicate = True
                     break
 
@@ -75,7 +96,12 @@ def deduplicate(articles: list[Article]) -> list[Article]:
 
             kept.append(article)
             kept_urls.add(article.url)
-            kept_title_sets.append(normalized)
+            for word in normalized:
+                sizes, positions = word_index.setdefault(word, ([], []))
+                at = bisect_right(sizes, n_new)
+                sizes.insert(at, n_new)
+                positions.insert(at, len(kept_title_sizes))
+            kept_title_sizes.append(n_new)
 
         logger.info(
             "Topic '%s': %d → %d articles after deduplication",
@@ -5,37 +5,80 @@ Async RSS feed fetching service.
 import asyncio
 import html
 import logging
+import os
 import re
-from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from time import struct_time
 
 import feedparser
 import httpx
+import msgspec
+from lxml import etree
 
 logger = logging.getLogger(__name__)
 
 TIMEOUT = httpx.Timeout(10.0, connect=5.0)
-MAX_CONCURRENT = 10  # max simultaneous open connections
+MAX_CONCURRENT = 10  # max simultaneous open connections per fetch run
+# HTTP/2 multiplexes requests per host, so idle connections are cheap to keep.
+LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=50)
+HEADERS = {
+    "User-Agent": "daily-ai-digest/1.0 (RSS Reader)",
+    "Accept": "application/rss+xml, application/atom+xml, application/xml;q=0.9, */*;q=0.8",
+    "Accept-Encoding": "gzip, deflate, br",  # br is decoded via the brotli package
+}
+FEED_CACHE_SIZE = 512  # max feeds remembered for conditional GET
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+
+# XML namespaces used by the fast parser
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_RSS1 = "{http://purl.org/rss/1.0/}"
+_CONTENT_ENCODED = "{http://purl.org/rss/1.0/modules/content/}encoded"
+_DC_DATE = "{http://purl.org/dc/elements/1.1/}date"
+_ENTRY_TAGS = ("item", f"{_RSS1}item", f"{_ATOM}entry")
 
 
 # Data model
-@dataclass
-class Article:
+class Article(msgspec.Struct, frozen=True):
     title: str
     url: str
     summary: str
     published: datetime | None
-    source: str   
-    topic: str    
+    source: str
+    topic: str
+
+
+# Conditional GET cache: (topic_id, source_name, url) -> (ETag, Last-Modified, articles)
+# from the last successful fetch, evicted least recently used first.
+_feed_cache: OrderedDict[tuple[str, str, str], tuple[str | None, str | None, list[Article]]] = OrderedDict()
+
+
+# Dedicated threads for the feedparser fallback, created on first use, so
+# slow parses don't compete with other blocking work on the default executor.
+_parse_pool: ThreadPoolExecutor | None = None
 
 
 # Internal helpers
+def _get_parse_pool() -> ThreadPoolExecutor:
+    """Return the feed parsing thread pool, creating it if needed."""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ThreadPoolExecutor(
+            max_workers=os.cpu_count(),
+            thread_name_prefix="feedparse",
+        )
+    return _parse_pool
+
+
 def _strip_html(text: str) -> str:
     """Remove HTML tags and decode entities from a string."""
-    text = re.sub(r"<[^>]+>", " ", text)   # strip tags
-    text = html.unescape(text)              # &amp; → &, etc.
-    text = re.sub(r"\s+", " ", text)        # collapse whitespace
+    text = _TAG_RE.sub(" ", text)   # strip tags
+    text = html.unescape(text)      # &amp; → &, etc.
+    text = _WS_RE.sub(" ", text)    # collapse whitespace
     return text.strip()
 
 def _parse_date(entry: feedparser.FeedParserDict) -> datetime | None:
@@ -50,6 +93,148 @@ def _parse_date(entry: feedparser.FeedParserDict) -> datetime | None:
         return None
 
 
+def _parse_date_text(raw: str) -> datetime | None:
+    """Parse an RFC 822 (RSS) or ISO 8601 (Atom) date into a UTC datetime."""
+    raw = raw.strip()
+    if not raw:
+        return None
+    try:
+        parsed = parsedate_to_datetime(raw)
+    except (TypeError, ValueError, IndexError, OverflowError):
+        try:
+            parsed = datetime.fromisoformat(raw)
+        except (ValueError, OverflowError):
+            return None
+    try:
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.astimezone(timezone.utc)
+    except (ValueError, OverflowError):
+        # e.g. year 9999 with a negative offset overflows when shifted to UTC
+        return None
+
+
+def _child_text(element: etree._Element, tag: str) -> str:
+    """Return the full text content of the first child with the given tag."""
+    child = element.find(tag)
+    if child is None:
+        return ""
+    return "".join(child.itertext())
+
+
+def _atom_link(entry: etree._Element) -> str:
+    """Return the alternate link of an Atom entry, else its first link."""
+    links = entry.findall(f"{_ATOM}link")
+    for link in links:
+        if link.get("rel", "alternate") == "alternate" and link.get("href"):
+            return link.get("href")
+    return links[0].get("href", "") if links else ""
+
+
+def _entry_to_article(entry: etree._Element, source_name: str, topic_id: str) -> Article | None:
+    """Build an Article from an RSS 2.0, RSS 1.0 or Atom entry element.
+
+    Only the fields an Article needs are read. Returns None for unusable entries.
+    """
+    if entry.tag == f"{_ATOM}entry":
+        title = _child_text(entry, f"{_ATOM}title")
+        url = _atom_link(entry)
+        raw_summary = (
+            _child_text(entry, f"{_ATOM}summary")
+            or _child_text(entry, f"{_ATOM}content")
+        )
+        raw_date = (
+            _child_text(entry, f"{_ATOM}published")
+            or _child_text(entry, f"{_ATOM}updated")
+        )
+    else:
+        ns = _RSS1 if entry.tag == f"{_RSS1}item" else ""
+        title = _child_text(entry, f"{ns}title")
+        url = _child_text(entry, f"{ns}link")
+        if not url:
+            guid = entry.find("guid")
+            if guid is not None and guid.get("isPermaLink", "true") != "false":
+                url = guid.text or ""
+        raw_summary = (
+            _child_text(entry, f"{ns}description")
+            or _child_text(entry, _CONTENT_ENCODED)
+        )
+        raw_date = _child_text(entry, "pubDate") or _child_text(entry, _DC_DATE)
+
+    title = _strip_html(title)
+    url = url.strip()
+
+    # Skip unusable entries
+    if not title or not url:
+        return None
+
+    return Article(
+        title=title,
+        url=url,
+        summary=_strip_html(raw_summary),
+        published=_parse_date_text(raw_date),
+        source=source_name,
+        topic=topic_id,
+    )
+
+
+class _StreamingFeedParser:
+    """Incrementally parse feed bytes into Articles as chunks arrive."""
+
+    def __init__(self, source_name: str, topic_id: str) -> None:
+        self._parser = etree.XMLPullParser(
+            events=("end",),
+            tag=_ENTRY_TAGS,
+            resolve_entities=False,
+            no_network=True,
+        )
+        self._source_name = source_name
+        self._topic_id = topic_id
+        self._failed = False
+        self.articles: list[Article] = []
+
+    def feed(self, chunk: bytes) -> None:
+        """Parse the next chunk of the response body."""
+        if self._failed:
+            return
+        try:
+            self._parser.feed(chunk)
+            self._drain()
+        except etree.XMLSyntaxError:
+            self._failed = True
+
+    def close(self) -> list[Article] | None:
+        """Finish parsing. Returns None if the XML was malformed."""
+        if not self._failed:
+            try:
+                self._parser.close()
+                self._drain()
+            except etree.XMLSyntaxError:
+                self._failed = True
+        return None if self._failed else self.articles
+
+    def _drain(self) -> None:
+        for _, entry in self._parser.read_events():
+            try:
+                article = _entry_to_article(entry, self._source_name, self._topic_id)
+            except Exception as e:
+                # Feed content is external: drop the bad entry, keep the feed.
+                logger.warning("Skipping unparseable entry from %s: %s", self._source_name, e)
+                article = None
+            # Entries are no longer needed once read; free them as we go.
+            entry.clear()
+            if article is not None:
+                self.articles.append(article)
+
+
+def _parse_with_feedparser(content: bytes, source_name: str, topic_id: str) -> list[Article] | None:
+    """Parse a feed with feedparser. Returns None if it is malformed and has no entries."""
+    feed: feedparser.FeedParserDict = feedparser.parse(content)
+    if feed.bozo and not feed.entries:
+        return None
+    return _parse_entries(feed, source_name, topic_id)
+
+
 def _parse_entries(
     feed: feedparser.FeedParserDict,
     source_name: str,
@@ -87,6 +272,20 @@ def _parse_entries(
     return articles
 
 
+def _cache_feed(key: tuple[str, str, str], response: httpx.Response, articles: list[Article]) -> None:
+    """Remember a feed's validators and articles for the next conditional GET."""
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if not etag and not last_modified:
+        _feed_cache.pop(key, None)
+        return
+
+    _feed_cache[key] = (etag, last_modified, articles)
+    _feed_cache.move_to_end(key)
+    while len(_feed_cache) > FEED_CACHE_SIZE:
+        _feed_cache.popitem(last=False)
+
+
 # Core fetch logic
 async def _fetch_feed(
     client: httpx.AsyncClient,
@@ -95,11 +294,36 @@ async def _fetch_feed(
     url: str,
     topic_id: str,
 ) -> list[Article]:
-    """Fetch a single RSS feed."""
+    """Fetch a single RSS feed, reusing cached articles if it is unchanged."""
+    # The cached articles carry topic and source, so both are part of the key.
+    cache_key = (topic_id, source_name, url)
+    cached = _feed_cache.get(cache_key)
+
+    headers: dict[str, str] = {}
+    if cached is not None:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    # Entries are parsed as chunks arrive so parsing overlaps the download.
+    # The raw bytes are kept in case the feedparser fallback is needed.
+    parser = _StreamingFeedParser(source_name, topic_id)
+    content = bytearray()
+
     async with sem:
         try:
-            response = await client.get(url, timeout=TIMEOUT)
-            response.raise_for_status()
+            async with client.stream("GET", url, headers=headers, timeout=TIMEOUT) as response:
+                if response.status_code == 304 and cached is not None:
+                    _feed_cache.move_to_end(cache_key)
+                    logger.info("Feed unchanged, reusing %d articles from %s", len(cached[2]), source_name)
+                    return list(cached[2])
+                response.raise_for_status()
+
+                async for chunk in response.aiter_bytes():
+                    content += chunk
+                    parser.feed(chunk)
         except httpx.TimeoutException:
             logger.warning("Timeout fetching %s (%s)", source_name, url)
             return []
@@ -110,38 +334,69 @@ async def _fetch_feed(
             logger.warning("Network error fetching %s: %s", source_name, e)
             return []
 
-    # feedparser.parse() is synchronous and CPU-bound on large feeds.
-    # run_in_executor offloads it to a thread so the event loop stays free.
-    loop = asyncio.get_event_loop()
-    feed: feedparser.FeedParserDict = await loop.run_in_executor(
-        None, feedparser.parse, response.text
-    )
+    articles = parser.close()
+    if not articles:
+        # lxml found nothing usable: retry with feedparser, which is much slower
+        # but tolerates broken markup and odd formats. It is synchronous and
+        # CPU-bound, so run_in_executor keeps the event loop free.
+        loop = asyncio.get_event_loop()
+        articles = await loop.run_in_executor(
+            _get_parse_pool(), _parse_with_feedparser, bytes(content), source_name, topic_id
+        )
 
-    if feed.bozo and not feed.entries:
+    if articles is None:
         logger.warning("Malformed feed from %s, skipping", source_name)
         return []
 
-    articles = _parse_entries(feed, source_name, topic_id)
+    _cache_feed(cache_key, response, articles)
     logger.info("Fetched %d articles from %s", len(articles), source_name)
     return articles
 
 
-async def fetch_all_feeds(topics_data: dict) -> list[Article]:
+# Public interface
+def create_client() -> httpx.AsyncClient:
+    """Create an HTTP client for feed fetching.
+
+    The API keeps one for the app lifetime so connections and TLS sessions
+    are reused across requests; close it with ``await client.aclose()``.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        follow_redirects=True,
+        headers=HEADERS,
+        timeout=TIMEOUT,
+        limits=LIMITS,
+    )
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the feed parsing threads; a later fetch starts a new pool."""
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=True)
+        _parse_pool = None
+
+
+async def fetch_all_feeds(
+    topics_data: dict,
+    client: httpx.AsyncClient | None = None,
+) -> list[Article]:
     """Fetch all enabled RSS feeds concurrently."""
+    if client is None:
+        # No shared client (e.g. Celery worker): use a short-lived one.
+        async with create_client() as client:
+            return await fetch_all_feeds(topics_data, client)
+
     sem = asyncio.Semaphore(MAX_CONCURRENT)
 
     enabled_topics = [t for t in topics_data.get("topics", []) if t.get("enabled", True)]
 
-    async with httpx.AsyncClient(
-        follow_redirects=True,
-        headers={"User-Agent": "daily-ai-digest/1.0 (RSS Reader)"},
-    ) as client:
-        tasks = [
-            _fetch_feed(client, sem, source["name"], source["url"], topic["id"])
-            for topic in enabled_topics
-            for source in topic.get("sources", [])
-        ]
-        results: list[list[Article]] = await asyncio.gather(*tasks)
+    tasks = [
+        _fetch_feed(client, sem, source["name"], source["url"], topic["id"])
+        for topic in enabled_topics
+        for source in topic.get("sources", [])
+    ]
+    results: list[list[Article]] = await asyncio.gather(*tasks)
 
     # Flatten and deduplicate by URL
     seen_urls: set[str] = set()
@@ -2,31 +2,63 @@
 Generate AI summaries of news articles.
 """
 
+import asyncio
+import hashlib
+import heapq
+import json
 import logging
-from dataclasses import dataclass
-from datetime import datetime, timezone
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 
+import msgspec
 from openai import AsyncOpenAI
 
 from app.services.fetcher import Article
 
 logger = logging.getLogger(__name__)
 
+MODEL = "gpt-4o-mini"
 MAX_ARTICLES_PER_TOPIC = 10
 MAX_SUMMARY_CHARS = 300
+MAX_CONCURRENT_REQUESTS = 5  # simultaneous LLM calls, to respect rate limits
+
+# Bump whenever the prompt changes so cached bullets are not reused.
+PROMPT_VERSION = 2
+
+# Instructions are identical for every topic, so they live in the system
+# message: the request prefix stays byte-identical across calls, which keeps
+# it eligible for OpenAI's automatic prompt caching.
+SYSTEM_PROMPT = """You are a concise news digest writer. You write clear, factual bullet points for busy readers.
+
+You will be given today's most recent articles for one topic of a personal daily digest.
+Write 5 concise bullet points summarizing the most important and interesting developments.
+Each bullet should:
+- Be 1-2 sentences max
+- Focus on what actually happened or what's new
+- Be written in plain English, no jargon
+- Include the source name in brackets at the end, e.g. [Hacker News]
+
+Return only the bullet points, one per line, starting each with "•"."""
+
+# Generated bullets are cached per topic + article set to skip repeat LLM calls.
+CACHE_PATH = Path(os.getenv("LLM_CACHE_PATH", "data/llm_cache.json"))
+CACHE_TTL = timedelta(hours=6)
+
+# Sort key for articles without a publish date, so they rank last
+_OLDEST = datetime.min.replace(tzinfo=timezone.utc)
 
 
 # Data model
-@dataclass
-class TopicDigest:
+class TopicDigest(msgspec.Struct):
     topic_id: str
     topic_name: str
     article_count: int        # how many articles were summarized
     bullets: list[str]        # the generated bullet points
     generated_at: datetime
 
-@dataclass
-class Digest:
+class Digest(msgspec.Struct):
     topics: list[TopicDigest]
     generated_at: datetime
     total_articles_summarized: int
@@ -34,41 +66,119 @@ class Digest:
 
 # Internal helpers
 def _trim_articles(articles: list[Article]) -> list[Article]:
-    """Sort articles by publish date and keep the most recent ones."""
-    def sort_key(a: Article):
-        if a.published is None:
-            return datetime.min.replace(tzinfo=timezone.utc)
-        return a.published
-
-    sorted_articles = sorted(articles, key=sort_key, reverse=True)
-    return sorted_articles[:MAX_ARTICLES_PER_TOPIC]
+    """Keep the most recent articles, newest first."""
+    return heapq.nlargest(
+        MAX_ARTICLES_PER_TOPIC,
+        articles,
+        key=lambda a: a.published or _OLDEST,
+    )
 
 
 def _build_prompt(topic_name: str, articles: list[Article]) -> str:
     """Build the user prompt sent to GPT-4o-mini for one topic."""
-    article_lines = []
-    for i, article in enumerate(articles, 1):
-        summary = article.summary[:MAX_SUMMARY_CHARS] if article.summary else "No summary available."
-        article_lines.append(
-            f"{i}. [{article.source}] {article.title}\n   {summary}"
-        )
+    articles_text = "\n\n".join(
+        f"{i}. [{a.source}] {a.title}\n   {a.summary[:MAX_SUMMARY_CHARS] or 'No summary available.'}"
+        for i, a in enumerate(articles, 1)
+    )
 
-    articles_text = "\n\n".join(article_lines)
-
-    return f"""You are summarizing today's top {topic_name} news for a personal daily digest.
+    return f"""Topic: {topic_name}
 
 Here are the {len(articles)} most recent articles:
 
-{articles_text}
+{articles_text}"""
 
-Write 5 concise bullet points summarizing the most important and interesting developments.
-Each bullet should:
-- Be 1-2 sentences max
-- Focus on what actually happened or what's new
-- Be written in plain English, no jargon
-- Include the source name in brackets at the end, e.g. [Hacker News]
 
-Return only the bullet points, one per line, starting each with "•"."""
+async def _generate_bullets(
+    client: AsyncOpenAI,
+    topic_name: str,
+    articles: list[Article],
+) -> list[str]:
+    """Ask the LLM for one topic's bullet points."""
+    response = await client.chat.completions.create(
+        model=MODEL,
+        messages=[
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPT,
+            },
+            {
+                "role": "user",
+                "content": _build_prompt(topic_name, articles),
+            },
+        ],
+        max_tokens=400,
+        temperature=0.3,
+    )
+
+    raw = response.choices[0].message.content or ""
+    bullets = [
+        line.strip()
+        for line in raw.splitlines()
+        if line.strip().startswith("•")
+    ]
+
+    if not bullets:
+        # Fallback: treat every non-empty line as a bullet
+        bullets = [f"• {line.strip()}" for line in raw.splitlines() if line.strip()]
+
+    return bullets
+
+
+def _cache_key(topic_id: str, topic_name: str, articles: list[Article]) -> str:
+    """Hash everything that determines the LLM output for one topic."""
+    payload = json.dumps(
+        [topic_id, topic_name, MODEL, PROMPT_VERSION, sorted(a.url for a in articles)]
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _load_cache(now: datetime) -> dict[str, dict]:
+    """Read the LLM cache from disk, dropping expired entries.
+
+    The cache is disposable: an unreadable or malformed file is treated as empty.
+    """
+    try:
+        entries = json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+        return {
+            key: entry
+            for key, entry in entries.items()
+            if isinstance(entry["bullets"], list)
+            and now - datetime.fromisoformat(entry["generated_at"]) < CACHE_TTL
+        }
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, TypeError, KeyError, AttributeError) as e:
+        logger.warning("Ignoring unreadable LLM cache %s: %s", CACHE_PATH, e)
+        return {}
+
+
+def _save_cache(entries: dict[str, dict]) -> None:
+    """Write the LLM cache to disk atomically.
+
+    Each writer uses its own temp file, so concurrent API and worker writes
+    never interleave; the last os.replace wins.
+    """
+    tmp_path = None
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            dir=CACHE_PATH.parent,
+            prefix=f".{CACHE_PATH.name}.",
+            suffix=".tmp",
+            delete=False,
+        ) as tmp:
+            tmp_path = tmp.name
+            json.dump(entries, tmp)
+        os.replace(tmp_path, CACHE_PATH)
+    except OSError as e:
+        logger.warning("Could not write LLM cache %s: %s", CACHE_PATH, e)
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
 
 
 # Public interface
@@ -93,65 +203,53 @@ async def summarize(
         by_topic.setdefault(article.topic, []).append(article)
 
     now = datetime.now(tz=timezone.utc)
-    topic_digests: list[TopicDigest] = []
-    total_summarized = 0
+    cache = _load_cache(now)
+    cache_updated = False
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
 
-    for topic_id, topic_articles in by_topic.items():
+    async def _summarize_topic(topic_id: str, topic_articles: list[Article]) -> TopicDigest:
+        nonlocal cache_updated
         trimmed = _trim_articles(topic_articles)
         topic_name = topic_names.get(topic_id, topic_id.title())
 
-        logger.info(
-            "Summarizing topic '%s': %d articles (trimmed from %d)",
-            topic_id, len(trimmed), len(topic_articles)
-        )
+        cache_key = _cache_key(topic_id, topic_name, trimmed)
+        cached = cache.get(cache_key)
 
-        try:
-            response = await client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are a concise news digest writer. "
-                            "You write clear, factual bullet points for busy readers."
-                        ),
-                    },
-                    {
-                        "role": "user",
-                        "content": _build_prompt(topic_name, trimmed),
-                    },
-                ],
-                max_tokens=400,
-                temperature=0.3,  
-            )
-
-            raw = response.choices[0].message.content or ""
-            bullets = [
-                line.strip()
-                for line in raw.splitlines()
-                if line.strip().startswith("•")
-            ]
-
-            if not bullets:
-                # Fallback: treat every non-empty line as a bullet
-                bullets = [f"• {line.strip()}" for line in raw.splitlines() if line.strip()]
-
-            logger.info("Generated %d bullets for topic '%s'", len(bullets), topic_id)
-
-        except Exception as e:
-            logger.error("Failed to summarize topic '%s': %s", topic_id, e)
-            bullets = [f"• Could not generate summary for {topic_name}: {e}"]
-
-        topic_digests.append(
-            TopicDigest(
-                topic_id=topic_id,
-                topic_name=topic_name,
-                article_count=len(trimmed),
-                bullets=bullets,
-                generated_at=now,
+        if cached is not None:
+            bullets = cached["bullets"]
+            logger.info("Reusing %d cached bullets for topic '%s'", len(bullets), topic_id)
+        else:
+            logger.info(
+                "Summarizing topic '%s': %d articles (trimmed from %d)",
+                topic_id, len(trimmed), len(topic_articles)
             )
+            try:
+                async with sem:
+                    bullets = await _generate_bullets(client, topic_name, trimmed)
+                logger.info("Generated %d bullets for topic '%s'", len(bullets), topic_id)
+                cache[cache_key] = {"bullets": bullets, "generated_at": now.isoformat()}
+                cache_updated = True
+
+            except Exception as e:
+                logger.error("Failed to summarize topic '%s': %s", topic_id, e)
+                bullets = [f"• Could not generate summary for {topic_name}: {e}"]
+
+        return TopicDigest(
+            topic_id=topic_id,
+            topic_name=topic_name,
+            article_count=len(trimmed),
+            bullets=bullets,
+            generated_at=now,
         )
-        total_summarized += len(trimmed)
+
+    # Topics are independent, so their LLM calls run concurrently.
+    topic_digests: list[TopicDigest] = await asyncio.gather(
+        *(_summarize_topic(tid, arts) for tid, arts in by_topic.items())
+    )
+    total_summarized = sum(t.article_count for t in topic_digests)
+
+    if cache_updated:
+        _save_cache(cache)
 
     return Digest(
         topics=topic_digests,